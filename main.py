@@ -1,20 +1,99 @@
 """
 main.py - Application entry point
 """
+import atexit
+import math
+import os
+import queue
+import signal
+import socket
+import struct
 import sys
 import time
+import wave
+from pathlib import Path
+from typing import Callable
 from PySide6.QtWidgets import QApplication
-from PySide6.QtCore import QTimer
+from PySide6.QtCore import Qt, QTimer, QRunnable, QThreadPool, QSocketNotifier, QUrl
 from PySide6.QtGui import QIcon
 
+try:
+    from PySide6.QtMultimedia import QSoundEffect
+except ImportError:  # QtMultimedia missing or no audio backend; use the system bell
+    QSoundEffect = None
+
 from timer_logic import PomodoroTimer, Mode
 from storage import Storage
 from ui import MainWindow
 
 
+# Refresh intervals (ms): once per second normally, faster for a smooth
+# progress bar only while a session is running and the window is active
+REFRESH_INTERVAL_MS = 1000
+FAST_REFRESH_INTERVAL_MS = 200
+
+# How often total study time is saved while a session runs
+SAVE_INTERVAL_SECONDS = 30
+
+# Mode switch beep: a short sine tone
+BEEP_FREQUENCY_HZ = 880
+BEEP_SECONDS = 0.25
+BEEP_SAMPLE_RATE = 44100
+
+
+def _write_beep_wav(path: Path) -> None:
+    """
+    Write the mode switch beep as a 16-bit mono WAV file.
+    
+    Written to a temporary file first, so an interrupted write never
+    leaves a truncated WAV in place of the real one.
+    """
+    frame_count = int(BEEP_SAMPLE_RATE * BEEP_SECONDS)
+    step = 2 * math.pi * BEEP_FREQUENCY_HZ / BEEP_SAMPLE_RATE
+    frames = b"".join(
+        struct.pack("<h", int(0.3 * 32767 * math.sin(step * i)))
+        for i in range(frame_count)
+    )
+    tmp_path = path.with_suffix(".wav.tmp")
+    with wave.open(str(tmp_path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(BEEP_SAMPLE_RATE)
+        wav.writeframes(frames)
+    os.replace(tmp_path, path)
+
+
+class SaveWorker(QRunnable):
+    """Write the latest pending total study time off the GUI thread."""
+    
+    def __init__(self, storage: Storage, pending: queue.Queue,
+                 on_saved: Callable[[float], None]):
+        super().__init__()
+        self.storage = storage
+        self.pending = pending
+        self.on_saved = on_saved
+    
+    def run(self) -> None:
+        """Save the newest queued value, if a previous worker hasn't already."""
+        try:
+            total_seconds = self.pending.get_nowait()
+        except queue.Empty:
+            return
+        if self.storage.update_total_study_seconds(total_seconds):
+            self.on_saved(total_seconds)
+
+
 class PomodoroApp:
     """Main application controller."""
     
+    __slots__ = (
+        "storage", "timer", "window", "current_theme", "_ui_cache",
+        "refresh_timer", "_align_timer", "_end_timer",
+        "_next_save_time", "_last_saved_total", "_save_pool", "_pending_total", "_beep",
+        # Qt holds weak references to bound-method slots
+        "__weakref__",
+    )
+    
     def __init__(self):
         # Initialize storage
         self.storage = Storage()
@@ -32,25 +111,70 @@ class PomodoroApp:
         self.current_theme = settings["theme"]
         self.window.apply_theme(self.current_theme)
         
+        # Last values pushed to the UI, so unchanged fields can be skipped
+        self._ui_cache = {}
+        
         # Connect signals
         self._connect_signals()
         
-        # Set up refresh timer (tick every 200ms for smooth updates)
+        # Set up refresh timer (coarse, so the OS can coalesce wakeups)
         self.refresh_timer = QTimer()
+        self.refresh_timer.setTimerType(Qt.CoarseTimer)
         self.refresh_timer.timeout.connect(self._on_tick)
-        self.refresh_timer.start(200)  # 200ms interval
         
-        # Auto-save timer (save total study time every 30 seconds)
-        self.save_timer = QTimer()
-        self.save_timer.timeout.connect(self._save_total_time)
-        self.save_timer.start(30000)  # 30 seconds
+        # One-shot timer used to align the first refresh to a second boundary
+        # (precise, as coarse slack could land it before the boundary)
+        self._align_timer = QTimer()
+        self._align_timer.setSingleShot(True)
+        self._align_timer.setTimerType(Qt.PreciseTimer)
+        self._align_timer.timeout.connect(self._on_aligned)
+        
+        # Precise one-shot timer that fires when the current session ends
+        self._end_timer = QTimer()
+        self._end_timer.setSingleShot(True)
+        self._end_timer.setTimerType(Qt.PreciseTimer)
+        self._end_timer.timeout.connect(self._handle_session_end)
+        
+        # Total study time as last written to storage; set by the save
+        # worker, and only once the write has succeeded
+        self._last_saved_total = self.timer.total_study_seconds
+        
+        # Single background thread for saves; at most one value waits in
+        # the queue so bursts of saves collapse into one write
+        self._save_pool = QThreadPool()
+        self._save_pool.setMaxThreadCount(1)
+        self._pending_total: queue.Queue = queue.Queue(maxsize=1)
+        
+        # Auto-save runs off the refresh tick rather than its own timer
+        self._next_save_time = time.monotonic() + SAVE_INTERVAL_SECONDS
+        
+        # Preload the mode switch sound so playing it is just a buffer start
+        self._beep = self._load_beep()
         
         # Initial UI update
         self._update_ui()
+        self._sync_timers()
         
         # Show window
         self.window.show()
     
+    def _load_beep(self):
+        """Return a loaded QSoundEffect for the beep, or None if unavailable."""
+        if QSoundEffect is None:
+            return None
+        
+        beep_file = self.storage.settings_dir / "beep.wav"
+        if not beep_file.exists():
+            try:
+                _write_beep_wav(beep_file)
+            except OSError:
+                return None
+        
+        beep = QSoundEffect()
+        beep.setSource(QUrl.fromLocalFile(str(beep_file)))
+        beep.setLoopCount(1)
+        return beep
+    
     def _connect_signals(self) -> None:
         """Connect UI signals to handlers."""
         self.window.set_time_requested.connect(self._on_set_time)
@@ -58,37 +182,129 @@ class PomodoroApp:
         self.window.reset_clicked.connect(self._on_reset)
         self.window.theme_requested.connect(self._on_theme)
     
+    def _refresh_interval(self) -> int:
+        """Return the refresh interval in ms for the current state."""
+        if (self.timer.running and not self.timer.paused
+                and self.window.isActiveWindow()):
+            return FAST_REFRESH_INTERVAL_MS
+        return REFRESH_INTERVAL_MS
+    
+    def _sync_timers(self) -> None:
+        """
+        Start refreshing while a session is counting down, stop when idle.
+        
+        Refresh ticks are aligned to land just after the display changes,
+        and the session end is scheduled directly instead of polled for.
+        """
+        self.refresh_timer.stop()
+        
+        if not self.timer.running or self.timer.paused or not self.timer.end_time:
+            # Nothing changes while idle or paused, so don't wake up at all;
+            # save now since the refresh tick won't do it until resumed
+            self._align_timer.stop()
+            self._end_timer.stop()
+            self._save_total_time()
+            return
+        
+        # Show the countdown as of now; right after a start or resume the
+        # first aligned tick is almost a second away
+        now = time.monotonic()
+        self.timer.tick(now)
+        self._update_fast()
+        
+        # MM:SS changes whenever the time left crosses a whole second
+        time_left = max(0.0, self.timer.end_time - now)
+        self._align_timer.start(int((time_left % 1.0) * 1000) + 10)
+        self._end_timer.start(math.ceil(time_left * 1000))
+    
+    def _on_aligned(self) -> None:
+        """Start the periodic refresh timer on a second boundary."""
+        self._on_tick()
+        self.refresh_timer.start(self._refresh_interval())
+    
     def _on_tick(self) -> None:
-        """Handle timer tick - update timer state and UI."""
+        """Handle timer tick - update timer state and UI, auto-save."""
         now = time.monotonic()
-        mode_switched = self.timer.tick(now)
+        self.timer.tick(now)
+        
+        # Mode and pause state only change in the handlers, which push them
+        if self._update_fast():
+            self._update_total_time()
+        
+        # Switch between fast and slow refresh as state/focus changes
+        interval = self._refresh_interval()
+        if self.refresh_timer.isActive() and self.refresh_timer.interval() != interval:
+            self.refresh_timer.setInterval(interval)
+        
+        if now >= self._next_save_time:
+            self._next_save_time = now + SAVE_INTERVAL_SECONDS
+            self._save_total_time()
+    
+    def _handle_session_end(self) -> None:
+        """Switch to the next session when the current one ends."""
+        self.timer.complete_session(time.monotonic())
         
-        if mode_switched:
-            # Play a beep when mode switches
+        # Play a beep when mode switches
+        if self._beep is not None and self._beep.status() == QSoundEffect.Status.Ready:
+            self._beep.play()
+        else:
             QApplication.beep()
         
         self._update_ui()
+        self._sync_timers()
     
     def _update_ui(self) -> None:
-        """Update all UI elements based on current timer state."""
-        # Timer display
-        time_str = self.timer.format_remaining()
-        self.window.update_timer_display(time_str)
+        """Update all UI elements whose displayed value has changed."""
+        self._update_fast()
+        self._update_total_time()
+        self._update_state()
+    
+    def _update_state(self) -> None:
+        """Update the mode label and pause button after a state change."""
+        cache = self._ui_cache
         
         # Mode display
-        mode_text = self.timer.mode.value
-        self.window.update_mode_display(mode_text)
+        mode_text = self.timer.mode
+        if cache.get("mode") != mode_text:
+            self.window.update_mode_display(mode_text)
+            cache["mode"] = mode_text
         
         # Pause button
-        self.window.update_pause_button(self.timer.running, self.timer.paused)
+        state = (self.timer.running, self.timer.paused)
+        if cache.get("state") != state:
+            self.window.update_pause_button(*state)
+            cache["state"] = state
+    
+    def _update_fast(self) -> bool:
+        """
+        Update the countdown display and progress bar.
+        
+        Returns:
+            True if the displayed MM:SS changed
+        """
+        cache = self._ui_cache
         
-        # Progress bar
+        # Progress bar (quantized so tiny float deltas don't trigger a repaint)
         progress = self.timer.get_progress()
-        self.window.update_progress(progress)
+        progress_bucket = int(progress * 1000)
+        if cache.get("progress") != progress_bucket:
+            self.window.update_progress(progress)
+            cache["progress"] = progress_bucket
         
-        # Total time studied
+        # Timer display
+        time_str = self.timer.format_remaining()
+        if cache.get("time") == time_str:
+            return False
+        self.window.update_timer_display(time_str)
+        cache["time"] = time_str
+        return True
+    
+    def _update_total_time(self) -> None:
+        """Update the total time studied, which needs only 1s granularity."""
         short, long = self.timer.format_total_study_time()
-        self.window.update_total_time(short, long)
+        if self._ui_cache.get("total") != long:
+            self.window.update_total_time(short, long)
+            self._ui_cache["total"] = long
     
     def _on_set_time(self) -> None:
         """Handle set time dialog."""
@@ -102,43 +318,89 @@ class PomodoroApp:
             self.timer.set_config(study_min, break_min)
             
             # Save settings
-            settings = self.storage.load_settings()
-            settings["study_minutes"] = study_min
-            settings["break_minutes"] = break_min
-            self.storage.save_settings(settings)
+            self.storage.update(study_minutes=study_min, break_minutes=break_min)
             
             self._update_ui()
+            self._sync_timers()
     
     def _on_pause(self) -> None:
         """Handle pause/resume button click."""
         self.timer.pause_toggle()
         self._update_ui()
+        self._sync_timers()
     
     def _on_reset(self) -> None:
         """Handle reset button click."""
         self.timer.reset()
         self._update_ui()
+        self._sync_timers()
     
     def _on_theme(self) -> None:
         """Handle theme selection."""
         theme = self.window.show_theme_dialog(self.current_theme)
         
-        if theme:
+        # Re-selecting the current theme changes nothing, so skip the save too
+        if theme and theme != self.current_theme:
             self.current_theme = theme
             self.window.apply_theme(theme)
             
             # Save theme
-            settings = self.storage.load_settings()
-            settings["theme"] = theme
-            self.storage.save_settings(settings)
+            self.storage.update(theme=theme)
     
-    def _save_total_time(self) -> None:
-        """Periodically save total study time."""
-        self.storage.update_total_study_seconds(self.timer.total_study_seconds)
+    def _save_total_time(self, force: bool = False) -> None:
+        """
+        Periodically save total study time.
+        
+        Skips the write when less than a second of study time has accrued
+        since the last save, unless force is set.
+        """
+        total = self.timer.get_total_study_seconds()
+        delta = abs(total - self._last_saved_total)
+        if delta == 0 or (delta < 1.0 and not force):
+            return
+        self._submit_save(total)
+    
+    def _submit_save(self, total_seconds: float) -> None:
+        """Queue a background save, replacing any save still waiting."""
+        try:
+            self._pending_total.get_nowait()
+        except queue.Empty:
+            pass
+        self._pending_total.put_nowait(total_seconds)
+        self._save_pool.start(
+            SaveWorker(self.storage, self._pending_total, self._on_total_saved)
+        )
+    
+    def _on_total_saved(self, total_seconds: float) -> None:
+        """Record a total the save worker wrote (called on its thread)."""
+        self._last_saved_total = total_seconds
     
     def cleanup(self) -> None:
         """Save data before exit."""
-        self._save_total_time()
+        self._save_total_time(force=True)
+        self._save_pool.waitForDone()
+        self.storage.flush()
+
+
+def _quit_on_sigterm(app: QApplication) -> tuple:
+    """
+    Quit the event loop on SIGTERM so aboutToQuit handlers still run.
+    
+    Python only runs signal handlers when it regains control, so the signal
+    also writes to a socket watched by Qt, which wakes the event loop.
+    
+    Returns:
+        Objects that must be kept alive for as long as the app runs
+    """
+    read_sock, write_sock = socket.socketpair()
+    read_sock.setblocking(False)
+    write_sock.setblocking(False)
+    signal.set_wakeup_fd(write_sock.fileno())
+    
+    notifier = QSocketNotifier(read_sock.fileno(), QSocketNotifier.Read, app)
+    notifier.activated.connect(lambda: read_sock.recv(64))
+    signal.signal(signal.SIGTERM, lambda signum, frame: app.quit())
+    return read_sock, write_sock, notifier
 
 
 def main():
@@ -149,8 +411,11 @@ def main():
     # Create and run app
     pomo_app = PomodoroApp()
     
-    # Save on exit
+    # Save on exit, including on SIGTERM and when the interpreter exits
+    # without a clean Qt shutdown
     app.aboutToQuit.connect(pomo_app.cleanup)
+    atexit.register(pomo_app.cleanup)
+    signal_wakeup = _quit_on_sigterm(app)
     
     sys.exit(app.exec())
 
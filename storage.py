@@ -2,20 +2,74 @@
 storage.py - Persistent settings and total study time storage using JSON
 """
 import json
+import os
+import threading
+import time
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+
+try:
+    import orjson
+except ImportError:  # optional, falls back to the standard library
+    orjson = None
+
+
+def _dumps(settings: Dict[str, Any]) -> bytes:
+    """Encode settings as compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(settings)
+    return json.dumps(settings, separators=(',', ':')).encode()
+
+
+# Resolved once at import rather than on every Storage construction
+_SETTINGS_DIR = Path.home() / ".pomo_timer"
 
 
 class Storage:
-    """Handle loading and saving settings to a JSON file."""
+    """
+    Handle loading and saving settings to a JSON file.
     
-    def __init__(self):
-        # Create settings directory in user's home
-        self.settings_dir = Path.home() / ".pomo_timer"
-        self.settings_dir.mkdir(exist_ok=True)
+    Sync policies:
+        "always": every save is written and fsynced immediately.
+        "interval": saves are written without fsync, and total study time
+            updates are kept in memory and written at most once every
+            flush_interval seconds. Call flush() to force a durable write.
+    
+    Saving methods may be called from a background thread.
+    """
+    
+    # Whether the settings directory is known to exist
+    _dir_checked = False
+    
+    def __init__(self, sync_policy: str = "always", flush_interval: float = 30.0):
+        if sync_policy not in ("always", "interval"):
+            raise ValueError(f"Unknown sync policy: {sync_policy}")
+        self.sync_policy = sync_policy
+        self.flush_interval = flush_interval
+        
+        # Create settings directory in user's home (once per process)
+        self.settings_dir = _SETTINGS_DIR
+        if not Storage._dir_checked:
+            self.settings_dir.mkdir(exist_ok=True)
+            Storage._dir_checked = True
         self.settings_file = self.settings_dir / "settings.json"
+        # In-memory copy of the settings, read from disk only once
+        self._cache: Optional[Dict[str, Any]] = None
+        # Whether the cache holds changes not yet written to disk
+        self._dirty = False
+        # Whether the settings file was last written without an fsync
+        self._unsynced = False
+        self._last_write_time = time.monotonic()
+        # Serializes writes between the GUI thread and the save worker
+        self._lock = threading.RLock()
         
     def load_settings(self) -> Dict[str, Any]:
+        """Return the cached settings, reading them from disk on first use."""
+        if self._cache is None:
+            self._cache = self._read_settings()
+        return self._cache
+    
+    def _read_settings(self) -> Dict[str, Any]:
         """Load settings from JSON file, or return defaults if file doesn't exist."""
         defaults = {
             "study_minutes": 30,
@@ -51,20 +105,71 @@ class Storage:
     
     def save_settings(self, settings: Dict[str, Any]) -> None:
         """Save settings to JSON file."""
-        try:
-            with open(self.settings_file, 'w') as f:
-                json.dump(settings, f, indent=2)
-        except IOError as e:
-            print(f"Error saving settings: {e}")
+        with self._lock:
+            self._cache = settings
+            self._write(sync=self.sync_policy == "always")
+    
+    def update(self, **fields: Any) -> None:
+        """Set the given top-level settings and save them."""
+        with self._lock:
+            self.load_settings().update(fields)
+            self._write(sync=self.sync_policy == "always")
+    
+    def flush(self) -> None:
+        """Durably write any buffered changes to disk."""
+        with self._lock:
+            if self._dirty or self._unsynced:
+                self._write(sync=True)
     
-    def update_total_study_seconds(self, total_seconds: float) -> None:
-        """Update only the total study seconds in the settings file."""
-        settings = self.load_settings()
-        settings["total_study_seconds"] = total_seconds
-        self.save_settings(settings)
+    def _write(self, sync: bool) -> bool:
+        """
+        Write the cached settings atomically.
+        
+        The data goes to a temporary file which then replaces the settings
+        file, so a crash mid-write never leaves a truncated settings.json.
+        
+        Returns:
+            True if the settings were written
+        """
+        tmp_file = self.settings_file.with_suffix(".json.tmp")
+        with self._lock:
+            try:
+                # Compact encoding, handed to the file in a single write
+                data = _dumps(self._cache)
+                with open(tmp_file, 'wb') as f:
+                    f.write(data)
+                    if sync:
+                        f.flush()
+                        os.fsync(f.fileno())
+                os.replace(tmp_file, self.settings_file)
+            except OSError as e:
+                print(f"Error saving settings: {e}")
+                return False
+            self._dirty = False
+            self._unsynced = not sync
+            self._last_write_time = time.monotonic()
+            return True
+    
+    def update_total_study_seconds(self, total_seconds: float) -> bool:
+        """
+        Update only the total study seconds in the settings file.
+        
+        Returns:
+            False if writing the settings file failed
+        """
+        with self._lock:
+            settings = self.load_settings()
+            if settings["total_study_seconds"] == total_seconds:
+                return True
+            settings["total_study_seconds"] = total_seconds
+            self._dirty = True
+            
+            if self.sync_policy == "always":
+                return self._write(sync=True)
+            if time.monotonic() - self._last_write_time >= self.flush_interval:
+                return self._write(sync=False)
+            return True
     
     def reset_total_study_seconds(self) -> None:
         """Reset total study time to zero."""
-        settings = self.load_settings()
-        settings["total_study_seconds"] = 0
-        self.save_settings(settings)
+        self.update(total_study_seconds=0)
@@ -2,12 +2,15 @@
 timer_logic.py - Pomodoro timer state machine and time accounting
 """
 import time
-from enum import Enum
 from typing import Optional
 
 
-class Mode(Enum):
-    """Timer modes."""
+# Zero-padded two-digit strings, so MM:SS is built by indexing instead of formatting
+_TWO_DIGITS = [f"{i:02d}" for i in range(100)]
+
+
+class Mode:
+    """Timer modes (plain strings, cheap to compare on every tick)."""
     STUDY = "study"
     BREAK = "break"
 
@@ -19,6 +22,16 @@ class PomodoroTimer:
     Uses monotonic time to avoid drift and accurately tracks study time.
     """
     
+    __slots__ = (
+        "study_minutes", "break_minutes", "_study_seconds", "_break_seconds",
+        "total_study_seconds",
+        "mode", "running", "paused",
+        "duration_seconds", "remaining_seconds", "end_time",
+        "session_accum_start", "_inv_duration",
+        "_last_remaining_secs", "_last_remaining_str",
+        "_last_total_secs", "_last_total_strs",
+    )
+    
     def __init__(self, study_minutes: int = 30, break_minutes: int = 5, 
                  total_study_seconds: float = 0):
         """
@@ -31,18 +44,29 @@ class PomodoroTimer:
         """
         self.study_minutes = study_minutes
         self.break_minutes = break_minutes
+        # Session lengths in seconds, the values the timer actually runs on
+        self._study_seconds = study_minutes * 60
+        self._break_seconds = break_minutes * 60
         self.total_study_seconds = total_study_seconds
         
         # Current state
-        self.mode = Mode.STUDY
+        self.mode: str = Mode.STUDY
         self.running = False
         self.paused = False
         
         # Time tracking
-        self.duration_seconds = study_minutes * 60
+        self.duration_seconds = self._study_seconds
         self.remaining_seconds = self.duration_seconds
+        self._update_inv_duration()
         self.end_time: Optional[float] = None  # monotonic time when timer should end
-        self.last_tick_time: Optional[float] = None  # For tracking study time
+        # Monotonic time the current uninterrupted study stretch began
+        self.session_accum_start: Optional[float] = None
+        
+        # Last formatted strings, keyed by whole seconds (they change at most once/s)
+        self._last_remaining_secs = -1
+        self._last_remaining_str = ""
+        self._last_total_secs = -1
+        self._last_total_strs = ("", "")
         
     def start(self) -> None:
         """Start or resume the timer."""
@@ -52,7 +76,7 @@ class PomodoroTimer:
             self.paused = False
             # Set end time based on remaining seconds
             self.end_time = now + self.remaining_seconds
-            self.last_tick_time = now
+            self._begin_study_stretch(now)
     
     def pause_toggle(self) -> None:
         """Toggle between paused and running states."""
@@ -66,23 +90,24 @@ class PomodoroTimer:
             # Resume: adjust end_time based on remaining
             self.paused = False
             self.end_time = now + self.remaining_seconds
-            self.last_tick_time = now
+            self._begin_study_stretch(now)
         else:
             # Pause: update remaining and track study time
             if self.end_time:
                 self.remaining_seconds = max(0, self.end_time - now)
-            self._track_study_time(now)
+            self._end_study_stretch(now)
             self.paused = True
     
     def reset(self) -> None:
         """Reset the current session to full duration."""
+        self._end_study_stretch(time.monotonic())
         self.running = False
         self.paused = False
-        self.duration_seconds = (self.study_minutes * 60 if self.mode == Mode.STUDY 
-                                else self.break_minutes * 60)
+        self.duration_seconds = (self._study_seconds if self.mode == Mode.STUDY 
+                                else self._break_seconds)
         self.remaining_seconds = self.duration_seconds
+        self._update_inv_duration()
         self.end_time = None
-        self.last_tick_time = None
     
     def set_config(self, study_minutes: int, break_minutes: int) -> None:
         """
@@ -94,60 +119,86 @@ class PomodoroTimer:
         """
         self.study_minutes = study_minutes
         self.break_minutes = break_minutes
+        self._study_seconds = study_minutes * 60
+        self._break_seconds = break_minutes * 60
         self.reset()
     
-    def tick(self, now_monotonic: float) -> bool:
+    def tick(self, now_monotonic: float) -> None:
         """
-        Update timer state based on current time.
+        Update remaining time based on current time.
+        
+        Session completion is not detected here; the caller schedules
+        complete_session() for end_time instead of polling.
         
         Args:
             now_monotonic: Current monotonic time (time.monotonic())
-        
-        Returns:
-            True if mode switched, False otherwise
         """
         if not self.running or self.paused:
-            return False
-        
-        # Track study time since last tick
-        self._track_study_time(now_monotonic)
+            return
         
-        # Update remaining time
         if self.end_time:
             self.remaining_seconds = max(0, self.end_time - now_monotonic)
+    
+    def complete_session(self, now_monotonic: float) -> None:
+        """
+        Finish the current session and auto-start the next one.
         
-        # Check if session completed
-        if self.remaining_seconds <= 0:
-            self._switch_mode()
-            # Auto-start next session
-            self.start()
-            return True
-        
-        return False
+        Args:
+            now_monotonic: Current monotonic time (time.monotonic())
+        """
+        # Count study time only up to the scheduled end of the session
+        end = now_monotonic if self.end_time is None else min(now_monotonic, self.end_time)
+        self._end_study_stretch(end)
+        self._switch_mode()
+        # Auto-start next session
+        self.start()
+    
+    def _begin_study_stretch(self, now: float) -> None:
+        """Start counting study time from now if in study mode."""
+        if self.mode == Mode.STUDY:
+            self.session_accum_start = now
+    
+    def _end_study_stretch(self, now: float) -> None:
+        """Add the study time since the stretch began to the total."""
+        if self.session_accum_start is not None:
+            self.total_study_seconds += max(0.0, now - self.session_accum_start)
+            self.session_accum_start = None
     
-    def _track_study_time(self, now: float) -> None:
-        """Track elapsed study time if in study mode and running."""
-        if (self.mode == Mode.STUDY and self.running and not self.paused 
-            and self.last_tick_time is not None):
-            elapsed = now - self.last_tick_time
-            self.total_study_seconds += elapsed
+    def get_total_study_seconds(self, now: Optional[float] = None) -> float:
+        """
+        Get total study time including the stretch currently in progress.
+        
+        Args:
+            now: Current monotonic time, defaults to time.monotonic()
         
-        self.last_tick_time = now
+        Returns:
+            Total study time in seconds
+        """
+        if self.session_accum_start is None:
+            return self.total_study_seconds
+        if now is None:
+            now = time.monotonic()
+        return self.total_study_seconds + max(0.0, now - self.session_accum_start)
     
     def _switch_mode(self) -> None:
         """Switch between study and break modes."""
         if self.mode == Mode.STUDY:
             self.mode = Mode.BREAK
-            self.duration_seconds = self.break_minutes * 60
+            self.duration_seconds = self._break_seconds
         else:
             self.mode = Mode.STUDY
-            self.duration_seconds = self.study_minutes * 60
+            self.duration_seconds = self._study_seconds
         
         self.remaining_seconds = self.duration_seconds
+        self._update_inv_duration()
         self.running = False
         self.paused = False
         self.end_time = None
     
+    def _update_inv_duration(self) -> None:
+        """Precompute 1/duration so get_progress needs no division."""
+        self._inv_duration = 1.0 / self.duration_seconds if self.duration_seconds else 0.0
+    
     def get_progress(self) -> float:
         """
         Get current session progress.
@@ -155,10 +206,8 @@ class PomodoroTimer:
         Returns:
             Progress as a float between 0.0 and 1.0
         """
-        if self.duration_seconds == 0:
-            return 0.0
-        elapsed = self.duration_seconds - self.remaining_seconds
-        return min(1.0, max(0.0, elapsed / self.duration_seconds))
+        progress = (self.duration_seconds - self.remaining_seconds) * self._inv_duration
+        return 0.0 if progress < 0.0 else (1.0 if progress > 1.0 else progress)
     
     def format_remaining(self) -> str:
         """
@@ -168,9 +217,16 @@ class PomodoroTimer:
             Formatted time string
         """
         total_secs = int(self.remaining_seconds)
-        minutes = total_secs // 60
-        seconds = total_secs % 60
-        return f"{minutes:02d}:{seconds:02d}"
+        if total_secs == self._last_remaining_secs:
+            return self._last_remaining_str
+        
+        minutes, seconds = divmod(total_secs, 60)
+        self._last_remaining_secs = total_secs
+        if minutes < 100:
+            self._last_remaining_str = _TWO_DIGITS[minutes] + ":" + _TWO_DIGITS[seconds]
+        else:
+            self._last_remaining_str = f"{minutes:02d}:{seconds:02d}"
+        return self._last_remaining_str
     
     def format_total_study_time(self) -> tuple[str, str]:
         """
@@ -181,17 +237,25 @@ class PomodoroTimer:
             - short_format: "X.XX h"
             - long_format: "HH:MM:SS"
         """
-        total_secs = int(self.total_study_seconds)
+        total_study_seconds = self.get_total_study_seconds()
+        total_secs = int(total_study_seconds)
+        if total_secs == self._last_total_secs:
+            return self._last_total_strs
+        
         hours = total_secs // 3600
         minutes = (total_secs % 3600) // 60
         seconds = total_secs % 60
         
-        hours_decimal = self.total_study_seconds / 3600
+        hours_decimal = total_study_seconds / 3600
         short = f"{hours_decimal:.2f} h"
         long = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
         
+        self._last_total_secs = total_secs
+        self._last_total_strs = (short, long)
         return short, long
     
     def reset_total_study_time(self) -> None:
         """Reset total accumulated study time to zero."""
         self.total_study_seconds = 0
+        if self.session_accum_start is not None:
+            self.session_accum_start = time.monotonic()
@@ -1,13 +1,149 @@
 """
 ui.py - Main window UI with header, timer card, buttons, and progress bar
+
+NOTE: never call repaint() from handlers - use update(), which Qt coalesces,
+and pass it the smallest rect that actually changed.
 """
+import functools
+
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-    QPushButton, QDialog, QSpinBox, QDialogButtonBox, QMessageBox,
-    QColorDialog, QFrame
+    QPushButton, QDialog, QSpinBox, QDialogButtonBox, QFrame
 )
-from PySide6.QtCore import Qt, Signal, QRect
-from PySide6.QtGui import QPainter, QColor, QFont, QPalette, QMouseEvent
+from PySide6.QtCore import Qt, Signal, QRect, QRectF, QTimer
+from PySide6.QtGui import QPainter, QColor, QFont, QPalette, QMouseEvent, QPixmap, QPen
+
+
+# MainWindow dirty flags for updates deferred to the next event loop pass
+_DIRTY_TIME = 1
+_DIRTY_MODE = 2
+_DIRTY_PROGRESS = 4
+
+# Corner radius and border width of the pause/reset buttons
+_BUTTON_RADIUS = 5
+_BUTTON_BORDER = 2
+
+# Fonts shared by all widgets, built once
+_TIMER_FONT = QFont()
+_TIMER_FONT.setPointSize(72)
+_TIMER_FONT.setBold(True)
+
+_MODE_FONT = QFont()
+_MODE_FONT.setPointSize(16)
+
+_HEADER_FONT = QFont()
+_HEADER_FONT.setPointSize(11)
+
+_BUTTON_FONT = QFont()
+_BUTTON_FONT.setPixelSize(13)
+_BUTTON_FONT.setBold(True)
+
+# Preset themes offered by ThemeDialog; the first is the default
+PRESET_THEMES = [
+    ("Pink (Default)", {
+        "background_color": "#FFE5EC",
+        "card_color": "#FFD6E0",
+        "accent_color": "#FF9BB5",
+        "progress_color": "#FF9BB5",
+        "text_color": "#FFFFFF"
+    }),
+    ("Blue", {
+        "background_color": "#E3F2FD",
+        "card_color": "#BBDEFB",
+        "accent_color": "#42A5F5",
+        "progress_color": "#42A5F5",
+        "text_color": "#FFFFFF"
+    }),
+    ("Green", {
+        "background_color": "#E8F5E9",
+        "card_color": "#C8E6C9",
+        "accent_color": "#66BB6A",
+        "progress_color": "#66BB6A",
+        "text_color": "#FFFFFF"
+    })
+]
+
+
+@functools.lru_cache(maxsize=16)
+def _theme_stylesheets(bg_color: str, accent_color: str) -> tuple[str, str, str, str]:
+    """
+    Build the theme stylesheets for a background and accent color.
+    
+    Returns:
+        Tuple of (central, header, theme_button, mode_label) stylesheets
+    """
+    central_style = f"""
+            QWidget {{
+                background-color: {bg_color};
+            }}
+        """
+    header_style = f"""
+            QFrame {{
+                background-color: white;
+                border-bottom: 2px solid {accent_color};
+            }}
+            QLabel {{
+                color: {accent_color};
+                background: transparent;
+            }}
+        """
+    theme_button_style = f"""
+            QPushButton {{
+                color: {accent_color};
+                font-weight: bold;
+                font-size: 13px;
+                background: transparent;
+                border: none;
+            }}
+            QPushButton:hover {{
+                text-decoration: underline;
+            }}
+        """
+    mode_label_style = f"color: {accent_color};"
+    return central_style, header_style, theme_button_style, mode_label_style
+
+
+def _qcolor_from_hex(hex_color: str) -> QColor:
+    """Build a QColor from "#RRGGBB" via integers, skipping Qt's name parsing."""
+    if len(hex_color) != 7 or hex_color[0] != "#":
+        # Not plain hex (e.g. a named color in a hand-edited settings file)
+        return QColor(hex_color)
+    h = hex_color[1:]
+    try:
+        return QColor(int(h[0:2], 16), int(h[2:4], 16), int(h[4:6], 16))
+    except ValueError:
+        # Malformed hex; let Qt handle it (yields an invalid color)
+        return QColor(hex_color)
+
+
+@functools.lru_cache(maxsize=64)
+def _lighten_hex(hex_color: str) -> str:
+    """Lighten a hex color by raising its brightness 10%."""
+    if len(hex_color) != 7 or hex_color[0] != "#":
+        hex_color = QColor(hex_color).name()
+    h = hex_color[1:]
+    try:
+        r, g, b = int(h[0:2], 16), int(h[2:4], 16), int(h[4:6], 16)
+    except ValueError:
+        # Malformed hex; fall back to Qt's parsing (black if invalid)
+        r, g, b, _ = QColor(hex_color).getRgb()
+    # Increase value (brightness, the largest channel) by 10%; scaling all
+    # channels by the same factor keeps hue and saturation unchanged
+    v = max(r, g, b)
+    if v == 0:
+        return f"#{r:02x}{g:02x}{b:02x}"
+    new_v = min(255, (v * 110) // 100)
+    r, g, b = ((c * new_v + v // 2) // v for c in (r, g, b))
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+def _warm_preset_stylesheets() -> None:
+    """Build the preset stylesheets up front so picking a preset is a cache hit."""
+    for _, theme in PRESET_THEMES:
+        _theme_stylesheets(theme["background_color"], theme["accent_color"])
+
+
+_warm_preset_stylesheets()
 
 
 class ProgressBar(QWidget):
@@ -15,57 +151,90 @@ class ProgressBar(QWidget):
     
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.progress = 0.0
-        self.bg_color = QColor("#FFD6E0")  # Lighter pink
-        self.fill_color = QColor("#FF9BB5")  # Accent pink
+        self.progress_permille = 0  # Progress in thousandths, 0 to 1000
+        self._last_fill_px = 0  # Fill width last requested for painting
+        self.bg_color = _qcolor_from_hex("#FFD6E0")  # Lighter pink
+        self.fill_color = _qcolor_from_hex("#FF9BB5")  # Accent pink
         self.setFixedHeight(28)
+        self._rebuild_pixmaps()
     
     def set_progress(self, progress: float) -> None:
         """Set progress value (0.0 to 1.0)."""
-        self.progress = max(0.0, min(1.0, progress))
-        self.update()
+        self.set_progress_permille(int(round(progress * 1000)))
+    
+    def set_progress_permille(self, permille: int) -> None:
+        """Set progress in thousandths (0 to 1000), repainting only if the fill moves."""
+        permille = max(0, min(1000, permille))
+        if permille == self.progress_permille:
+            return
+        self.progress_permille = permille
+        
+        fill_px = (self.width() * permille) // 1000
+        old_px = self._last_fill_px
+        if fill_px == old_px:
+            return
+        self._last_fill_px = fill_px
+        
+        # Invalidate only the strip between the old and new fill edges
+        self.update(QRect(min(old_px, fill_px), 0, abs(fill_px - old_px) + 1, self.height()))
     
     def set_colors(self, bg_color: str, fill_color: str) -> None:
         """Update colors for theming."""
-        self.bg_color = QColor(bg_color)
-        self.fill_color = QColor(fill_color)
+        self.bg_color = _qcolor_from_hex(bg_color)
+        self.fill_color = _qcolor_from_hex(fill_color)
+        self._rebuild_pixmaps()
         self.update()
     
+    def _rebuild_pixmaps(self) -> None:
+        """Pre-render the background and full fill at the current size."""
+        self._bg_pixmap = QPixmap(self.size())
+        self._bg_pixmap.fill(self.bg_color)
+        self._fill_pixmap = QPixmap(self.size())
+        self._fill_pixmap.fill(self.fill_color)
+    
+    def resizeEvent(self, event):
+        """Keep the cached pixmaps and fill width in step with the new size."""
+        super().resizeEvent(event)
+        self._rebuild_pixmaps()
+        self._last_fill_px = (self.width() * self.progress_permille) // 1000
+    
     def paintEvent(self, event):
-        """Draw the progress bar."""
+        """Blit the damaged part of the progress bar from the cached pixmaps."""
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
+        damage = event.rect()
         
         # Draw background
-        painter.fillRect(self.rect(), self.bg_color)
+        painter.drawPixmap(damage, self._bg_pixmap, damage)
         
         # Draw fill
-        if self.progress > 0:
-            fill_width = int(self.width() * self.progress)
-            fill_rect = QRect(0, 0, fill_width, self.height())
-            painter.fillRect(fill_rect, self.fill_color)
+        if self.progress_permille > 0:
+            fill_width = (self.width() * self.progress_permille) // 1000
+            fill_rect = QRect(0, 0, fill_width, self.height()) & damage
+            if not fill_rect.isEmpty():
+                painter.drawPixmap(fill_rect, self._fill_pixmap, fill_rect)
 
 
-class TimerCard(QWidget):
-    """Custom clickable timer card widget."""
+class TimerCard(QFrame):
+    """
+    Custom clickable timer card widget.
+    
+    Background and border come from a stylesheet, so Qt draws them
+    without a Python paintEvent.
+    """
     
     clicked = Signal()
     
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.setObjectName("timerCard")
         self.setFixedSize(400, 300)
-        self.bg_color = QColor("#FFD6E0")
-        self.border_color = QColor("#FF9BB5")
-        self.text_color = QColor("#FFFFFF")
         
         # Create label for timer text
         self.timer_label = QLabel("Set time", self)
+        self._last_text = "Set time"
         self.timer_label.setAlignment(Qt.AlignCenter)
-        font = QFont()
-        font.setPointSize(72)
-        font.setBold(True)
-        self.timer_label.setFont(font)
-        self.timer_label.setStyleSheet("background: transparent; color: white;")
+        self.timer_label.setFont(_TIMER_FONT)
+        self.set_colors("#FFD6E0", "#FF9BB5", "#FFFFFF")
         
         # Layout
         layout = QVBoxLayout(self)
@@ -74,32 +243,84 @@ class TimerCard(QWidget):
     
     def set_time_text(self, text: str) -> None:
         """Update the timer display text."""
+        if text == self._last_text:
+            return
+        self._last_text = text
         self.timer_label.setText(text)
     
     def set_colors(self, bg_color: str, border_color: str, text_color: str) -> None:
         """Update colors for theming."""
-        self.bg_color = QColor(bg_color)
-        self.border_color = QColor(border_color)
-        self.text_color = QColor(text_color)
-        self.timer_label.setStyleSheet(f"background: transparent; color: {text_color};")
+        self.setStyleSheet(f"""
+            #timerCard {{
+                background-color: {bg_color};
+                border: 1px solid {border_color};
+            }}
+            #timerCard QLabel {{
+                background: transparent;
+                color: {text_color};
+            }}
+        """)
+    
+    def mousePressEvent(self, event: QMouseEvent) -> None:
+        """Emit clicked signal when card is clicked."""
+        if event.button() == Qt.LeftButton:
+            self.clicked.emit()
+
+
+class HoverButton(QPushButton):
+    """
+    Push button that swaps precomputed colors on hover.
+    
+    Painted directly rather than through a stylesheet with a :hover rule,
+    which makes Qt re-evaluate the stylesheet on every hover enter/leave.
+    """
+    
+    def __init__(self, text: str, parent=None):
+        super().__init__(text, parent)
+        self.setFont(_BUTTON_FONT)
+        self._hovered = False
+        self._border_color = QColor(Qt.white)
+        self._normal_colors = (QColor(Qt.white), QColor(Qt.black))
+        self._hover_colors = self._normal_colors
+    
+    def set_theme_colors(self, accent_color: str) -> None:
+        """Precompute the (background, text) colors for an accent color."""
+        accent = _qcolor_from_hex(accent_color)
+        white = QColor(Qt.white)
+        self._border_color = accent
+        self._normal_colors = (white, accent)
+        self._hover_colors = (accent, white)
         self.update()
     
+    def enterEvent(self, event):
+        """Switch to the hover colors."""
+        self._hovered = True
+        self.update()
+        super().enterEvent(event)
+    
+    def leaveEvent(self, event):
+        """Switch back to the normal colors."""
+        self._hovered = False
+        self.update()
+        super().leaveEvent(event)
+    
     def paintEvent(self, event):
-        """Draw the card with border."""
+        """Draw the rounded, bordered background and the centered text."""
+        background, text = self._hover_colors if self._hovered else self._normal_colors
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
         
-        # Draw background
-        painter.fillRect(self.rect(), self.bg_color)
+        # Keep the border inside the widget by insetting half its width
+        inset = _BUTTON_BORDER / 2
+        painter.setPen(QPen(self._border_color, _BUTTON_BORDER))
+        painter.setBrush(background)
+        painter.drawRoundedRect(
+            QRectF(self.rect()).adjusted(inset, inset, -inset, -inset),
+            _BUTTON_RADIUS, _BUTTON_RADIUS
+        )
         
-        # Draw border
-        painter.setPen(self.border_color)
-        painter.drawRect(self.rect().adjusted(0, 0, -1, -1))
-    
-    def mousePressEvent(self, event: QMouseEvent) -> None:
-        """Emit clicked signal when card is clicked."""
-        if event.button() == Qt.LeftButton:
-            self.clicked.emit()
+        painter.setPen(text)
+        painter.drawText(self.rect(), Qt.AlignCenter, self.text())
 
 
 class SetTimeDialog(QDialog):
@@ -143,6 +364,11 @@ class SetTimeDialog(QDialog):
         button_box.rejected.connect(self.reject)
         layout.addWidget(button_box)
     
+    def set_values(self, study_minutes: int, break_minutes: int) -> None:
+        """Reset the spin boxes before the dialog is shown again."""
+        self.study_spin.setValue(study_minutes)
+        self.break_spin.setValue(break_minutes)
+    
     def get_values(self) -> tuple[int, int]:
         """Return (study_minutes, break_minutes)."""
         return self.study_spin.value(), self.break_spin.value()
@@ -162,34 +388,12 @@ class ThemeDialog(QDialog):
         
         layout = QVBoxLayout(self)
         
-        # Preset buttons
-        presets = [
-            ("Pink (Default)", {
-                "background_color": "#FFE5EC",
-                "card_color": "#FFD6E0",
-                "accent_color": "#FF9BB5",
-                "progress_color": "#FF9BB5",
-                "text_color": "#FFFFFF"
-            }),
-            ("Blue", {
-                "background_color": "#E3F2FD",
-                "card_color": "#BBDEFB",
-                "accent_color": "#42A5F5",
-                "progress_color": "#42A5F5",
-                "text_color": "#FFFFFF"
-            }),
-            ("Green", {
-                "background_color": "#E8F5E9",
-                "card_color": "#C8E6C9",
-                "accent_color": "#66BB6A",
-                "progress_color": "#66BB6A",
-                "text_color": "#FFFFFF"
-            })
-        ]
-        
-        for name, theme in presets:
+        # Preset buttons, all sharing one slot that looks up the sender's index
+        self._presets = [theme for _name, theme in PRESET_THEMES]
+        for i, (name, _theme) in enumerate(PRESET_THEMES):
             btn = QPushButton(name)
-            btn.clicked.connect(lambda checked, t=theme: self.select_preset(t))
+            btn.setProperty("preset_index", i)
+            btn.clicked.connect(self._on_preset_clicked)
             layout.addWidget(btn)
         
         layout.addStretch()
@@ -204,15 +408,27 @@ class ThemeDialog(QDialog):
         cancel_btn.clicked.connect(self.reject)
         layout.addWidget(cancel_btn)
     
+    def set_current_theme(self, current_theme: dict) -> None:
+        """Prepare the dialog to be shown again for the given theme."""
+        self.current_theme = current_theme
+        self.selected_theme = None
+    
+    def _on_preset_clicked(self) -> None:
+        """Select the preset belonging to the clicked button."""
+        self.select_preset(self._presets[self.sender().property("preset_index")])
+    
     def select_preset(self, theme: dict) -> None:
         """Select a preset theme."""
-        self.selected_theme = theme
+        self.selected_theme = dict(theme)
         self.accept()
     
     def select_custom(self) -> None:
         """Open color picker for custom theme."""
+        # Imported on first use; most sessions never open the color picker
+        from PySide6.QtWidgets import QColorDialog
+        
         bg_color = QColorDialog.getColor(
-            QColor(self.current_theme["background_color"]),
+            _qcolor_from_hex(self.current_theme["background_color"]),
             self,
             "Choose Background Color"
         )
@@ -220,7 +436,7 @@ class ThemeDialog(QDialog):
             return
         
         card_color = QColorDialog.getColor(
-            QColor(self.current_theme["card_color"]),
+            _qcolor_from_hex(self.current_theme["card_color"]),
             self,
             "Choose Card Color"
         )
@@ -228,7 +444,7 @@ class ThemeDialog(QDialog):
             return
         
         accent_color = QColorDialog.getColor(
-            QColor(self.current_theme["accent_color"]),
+            _qcolor_from_hex(self.current_theme["accent_color"]),
             self,
             "Choose Accent/Text Color"
         )
@@ -236,7 +452,7 @@ class ThemeDialog(QDialog):
             return
         
         progress_color = QColorDialog.getColor(
-            QColor(self.current_theme["progress_color"]),
+            _qcolor_from_hex(self.current_theme["progress_color"]),
             self,
             "Choose Progress Fill Color"
         )
@@ -291,9 +507,7 @@ class MainWindow(QMainWindow):
         # Mode label
         self.mode_label = QLabel("study")
         self.mode_label.setAlignment(Qt.AlignCenter)
-        mode_font = QFont()
-        mode_font.setPointSize(16)
-        self.mode_label.setFont(mode_font)
+        self.mode_label.setFont(_MODE_FONT)
         content_layout.addWidget(self.mode_label)
         
         # Timer card
@@ -307,12 +521,12 @@ class MainWindow(QMainWindow):
         buttons_layout = QHBoxLayout()
         buttons_layout.setSpacing(15)
         
-        self.pause_button = QPushButton("pause")
+        self.pause_button = HoverButton("pause")
         self.pause_button.setFixedSize(100, 40)
         self.pause_button.clicked.connect(self.pause_clicked.emit)
         buttons_layout.addWidget(self.pause_button)
         
-        self.reset_button = QPushButton("reset")
+        self.reset_button = HoverButton("reset")
         self.reset_button.setFixedSize(100, 40)
         self.reset_button.clicked.connect(self.reset_clicked.emit)
         buttons_layout.addWidget(self.reset_button)
@@ -325,14 +539,25 @@ class MainWindow(QMainWindow):
         self.progress_bar = ProgressBar()
         main_layout.addWidget(self.progress_bar)
         
+        # Last values shown, so unchanged updates don't touch the widgets
+        self._last_mode = "study"
+        self._last_pause_text = "pause"
+        self._last_total_short = "0.00 h"
+        self._last_total_long = ""
+        
+        # Pending values for the deferred updates, and which ones are set
+        self._dirty_flags = 0
+        self._pending_time = ""
+        self._pending_mode = ""
+        self._pending_progress = 0.0
+        
+        # Dialogs are built on first use and reused afterwards
+        self._set_time_dialog: SetTimeDialog | None = None
+        self._theme_dialog: ThemeDialog | None = None
+        
         # Apply default theme
-        self.apply_theme({
-            "background_color": "#FFE5EC",
-            "card_color": "#FFD6E0",
-            "accent_color": "#FF9BB5",
-            "progress_color": "#FF9BB5",
-            "text_color": "#FFFFFF"
-        })
+        self._current_theme: dict | None = None
+        self.apply_theme(PRESET_THEMES[0][1])
     
     def _create_header(self) -> QWidget:
         """Create the top header bar."""
@@ -362,139 +587,140 @@ class MainWindow(QMainWindow):
         
         # Total time studied label
         total_label = QLabel("total time studied")
-        total_font = QFont()
-        total_font.setPointSize(11)
-        total_label.setFont(total_font)
+        total_label.setFont(_HEADER_FONT)
         layout.addWidget(total_label)
         
         layout.addSpacing(10)
         
         # Total time value
         self.total_time_label = QLabel("0.00 h")
-        self.total_time_label.setFont(total_font)
+        self.total_time_label.setFont(_HEADER_FONT)
         self.total_time_label.setStyleSheet("font-weight: bold;")
-        self.total_time_label.setCursor(Qt.WhatsThisCursor)
         layout.addWidget(self.total_time_label)
         
         return header
     
+    def _mark_dirty(self, flag: int) -> None:
+        """Schedule a flush of the deferred updates if none is pending."""
+        if not self._dirty_flags:
+            QTimer.singleShot(0, self._flush_ui)
+        self._dirty_flags |= flag
+    
+    def _flush_ui(self) -> None:
+        """Apply the deferred updates together once the event loop is idle."""
+        flags = self._dirty_flags
+        self._dirty_flags = 0
+        
+        if flags & _DIRTY_TIME:
+            self.timer_card.set_time_text(self._pending_time)
+        if flags & _DIRTY_MODE and self._pending_mode != self._last_mode:
+            self._last_mode = self._pending_mode
+            self.mode_label.setText(self._pending_mode)
+        if flags & _DIRTY_PROGRESS:
+            self.progress_bar.set_progress(self._pending_progress)
+    
     def update_timer_display(self, time_str: str) -> None:
         """Update the timer card display."""
-        self.timer_card.set_time_text(time_str)
+        self._pending_time = time_str
+        self._mark_dirty(_DIRTY_TIME)
     
     def update_mode_display(self, mode: str) -> None:
         """Update the mode label."""
-        self.mode_label.setText(mode)
+        self._pending_mode = mode
+        self._mark_dirty(_DIRTY_MODE)
     
     def update_pause_button(self, is_running: bool, is_paused: bool) -> None:
         """Update pause button text."""
-        if is_running and not is_paused:
-            self.pause_button.setText("pause")
-        else:
-            self.pause_button.setText("start")
+        text = "pause" if is_running and not is_paused else "start"
+        if text == self._last_pause_text:
+            return
+        self._last_pause_text = text
+        self.pause_button.setText(text)
     
     def update_progress(self, progress: float) -> None:
         """Update the progress bar."""
-        self.progress_bar.set_progress(progress)
+        self._pending_progress = progress
+        self._mark_dirty(_DIRTY_PROGRESS)
     
     def update_total_time(self, short_format: str, long_format: str) -> None:
         """Update total time studied display."""
-        self.total_time_label.setText(short_format)
-        self.total_time_label.setToolTip(long_format)
+        # Checked separately so a tooltip-only change doesn't repaint the label
+        if short_format != self._last_total_short:
+            self._last_total_short = short_format
+            self.total_time_label.setText(short_format)
+        if long_format != self._last_total_long:
+            self._last_total_long = long_format
+            self.total_time_label.setToolTip(long_format)
     
     def apply_theme(self, theme: dict) -> None:
-        """Apply color theme to the UI."""
+        """Apply color theme to the UI, unless it is already applied."""
+        if theme == self._current_theme:
+            return
+        
         bg_color = theme["background_color"]
         card_color = theme["card_color"]
         accent_color = theme["accent_color"]
         progress_color = theme["progress_color"]
         text_color = theme["text_color"]
         
+        central_style, header_style, theme_button_style, mode_label_style = (
+            _theme_stylesheets(bg_color, accent_color)
+        )
+        
         # Main background
-        self.centralWidget().setStyleSheet(f"""
-            QWidget {{
-                background-color: {bg_color};
-            }}
-        """)
+        self.centralWidget().setStyleSheet(central_style)
         
         # Header styling
-        self.header.setStyleSheet(f"""
-            QFrame {{
-                background-color: white;
-                border-bottom: 2px solid {accent_color};
-            }}
-        """)
+        self.header.setStyleSheet(header_style)
         
         # Theme button and labels
-        self.theme_button.setStyleSheet(f"""
-            QPushButton {{
-                color: {accent_color};
-                font-weight: bold;
-                font-size: 13px;
-                background: transparent;
-                border: none;
-            }}
-            QPushButton:hover {{
-                text-decoration: underline;
-            }}
-        """)
+        self.theme_button.setStyleSheet(theme_button_style)
         
-        self.mode_label.setStyleSheet(f"color: {accent_color};")
-        
-        header_labels = self.header.findChildren(QLabel)
-        for label in header_labels:
-            label.setStyleSheet(f"color: {accent_color}; background: transparent;")
+        self.mode_label.setStyleSheet(mode_label_style)
         
         # Timer card
         self.timer_card.set_colors(card_color, accent_color, text_color)
         
         # Buttons
-        button_style = f"""
-            QPushButton {{
-                background-color: white;
-                color: {accent_color};
-                border: 2px solid {accent_color};
-                border-radius: 5px;
-                font-size: 13px;
-                font-weight: bold;
-            }}
-            QPushButton:hover {{
-                background-color: {accent_color};
-                color: white;
-            }}
-        """
-        self.pause_button.setStyleSheet(button_style)
-        self.reset_button.setStyleSheet(button_style)
+        self.pause_button.set_theme_colors(accent_color)
+        self.reset_button.set_theme_colors(accent_color)
         
         # Progress bar
         lighter_bg = self._lighten_color(bg_color)
         self.progress_bar.set_colors(lighter_bg, progress_color)
+        
+        self._current_theme = dict(theme)
     
     def _lighten_color(self, hex_color: str) -> str:
         """Lighten a hex color for progress background."""
-        color = QColor(hex_color)
-        h, s, v, a = color.getHsv()
-        # Increase value (brightness) by 10%
-        v = min(255, int(v * 1.1))
-        color.setHsv(h, s, v, a)
-        return color.name()
+        return _lighten_hex(hex_color)
     
     def show_set_time_dialog(self, study_min: int, break_min: int) -> tuple[int, int] | None:
         """Show the set time dialog and return values if accepted."""
-        dialog = SetTimeDialog(study_min, break_min, self)
+        dialog = self._set_time_dialog
+        if dialog is None:
+            dialog = self._set_time_dialog = SetTimeDialog(study_min, break_min, self)
+        else:
+            dialog.set_values(study_min, break_min)
         if dialog.exec() == QDialog.Accepted:
             return dialog.get_values()
         return None
     
     def show_theme_dialog(self, current_theme: dict) -> dict | None:
         """Show theme selection dialog."""
-        dialog = ThemeDialog(current_theme, self)
+        dialog = self._theme_dialog
+        if dialog is None:
+            dialog = self._theme_dialog = ThemeDialog(current_theme, self)
+        else:
+            dialog.set_current_theme(current_theme)
         if dialog.exec() == QDialog.Accepted:
             return dialog.get_theme()
         return None
     
     def show_reset_total_confirmation(self) -> bool:
         """Show confirmation dialog for resetting total study time."""
+        from PySide6.QtWidgets import QMessageBox
+        
         reply = QMessageBox.question(
             self,
             "Reset Total Study Time",